@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Shared, process-wide cached helpers for the pythonocc-core hooks.
+
+PyInstaller may evaluate OCC hooks more than once during a build;
+the submodule list, package tree scan and conda library scan only
+depend on the installed environment, so each is computed once per
+Python process.
+"""
+
+import os
+import re
+import json
+import fnmatch
+import functools
+
+from PyInstaller.compat import is_win, is_darwin
+from PyInstaller.utils.hooks import collect_submodules, get_package_paths
+
+
+@functools.lru_cache(maxsize=None)
+def _collect_submodules():
+    return tuple(collect_submodules('OCC'))
+
+
+def get_hiddenimports():
+    """All OCC submodule names (imports every OCC module only once)"""
+    return list(_collect_submodules())
+
+
+@functools.lru_cache(maxsize=None)
+def get_pkg_dir():
+    """Directory of the installed OCC package"""
+    pkg_base, occ_pkg_dir = get_package_paths('OCC')
+    return occ_pkg_dir
+
+
+# ==========================================
+# OCC package tree
+# ==========================================
+# Directories that never contain files we bundle
+_SKIP_DIRS = {'__pycache__', '.git', '.mypy_cache', '.pytest_cache'}
+
+# Extension module suffixes (without the dot), one set lookup per file.
+# Pure-Python OCC modules are frozen by PyInstaller from hiddenimports.
+_BIN_EXTS = frozenset({'pyd', 'so', 'dylib'})
+
+
+def _walk_once(top, visited):
+    """Single os.scandir pass over the OCC tree.
+
+    Yields (src_path, dest_dir) for .pyd/.so/.dylib extension modules and
+    appends (directory, st_mtime_ns) for every directory it lists to
+    ``visited``. The mtime is read before listing, so a change made during
+    the scan invalidates the cached result on the next run.
+    """
+    # Each directory carries its destination, so children are named by
+    # string concatenation rather than os.path.relpath/join per level.
+    stack = [(top, 'OCC')]
+    while stack:
+        root, dest_dir = stack.pop()
+        
+        try:
+            mtime = os.stat(root).st_mtime_ns
+            it = os.scandir(root)
+        except OSError:
+            # os.walk silently skips unreadable directories; do the same
+            continue
+        visited.append((root, mtime))
+        
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    name = entry.name
+                    if name not in _SKIP_DIRS and not name.startswith('.'):
+                        stack.append((entry.path, dest_dir + os.sep + name))
+                    continue
+                if not entry.is_file():
+                    continue
+                
+                if entry.name.rpartition('.')[2] in _BIN_EXTS:
+                    yield entry.path, dest_dir
+
+
+# On-disk cache of the package scan, reused across PyInstaller runs.
+# Set OCC_HOOK_NO_CACHE=1 to always rescan.
+_CACHE_VERSION = 3
+
+
+def _cache_path():
+    """Per-user cache file (never the shared system temp directory)"""
+    if is_win:
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'step2stl', 'occ_hook_cache.json')
+
+
+def _dir_mtimes(dirs):
+    """st_mtime_ns of each directory, None for ones that no longer exist"""
+    mtimes = []
+    for d in dirs:
+        try:
+            mtimes.append(os.stat(d).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return mtimes
+
+
+def _load_cached_scan(occ_pkg_dir):
+    """Cached scan result, or None when any scanned directory has changed.
+
+    Adding, removing or renaming an entry updates the mtime of the
+    directory holding it, so checking every directory the walk listed
+    catches changes anywhere in the tree with one stat per directory.
+    """
+    try:
+        with open(_cache_path(), 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached['version'] != _CACHE_VERSION or cached['root'] != os.path.normcase(occ_pkg_dir):
+            return None
+        if _dir_mtimes(cached['dirs']) != cached['mtimes']:
+            return None
+        return tuple((src, dest) for src, dest in cached['result'])
+    except Exception:
+        return None
+
+
+def _store_cached_scan(occ_pkg_dir, dirs, mtimes, result):
+    cache_path = _cache_path()
+    tmp_path = '%s.%d.tmp' % (cache_path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': _CACHE_VERSION,
+                'root': os.path.normcase(occ_pkg_dir),
+                'dirs': dirs,
+                'mtimes': mtimes,
+                'result': result,
+            }, f)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+@functools.lru_cache(maxsize=None)
+def collect_extension_modules(occ_pkg_dir):
+    """Compiled extension modules of the OCC package
+
+    Returns:
+        tuple of (src_path, dest_dir)
+    """
+    use_cache = os.environ.get('OCC_HOOK_NO_CACHE') in (None, '', '0')
+    if use_cache:
+        cached = _load_cached_scan(occ_pkg_dir)
+        if cached is not None:
+            return cached
+    
+    visited = []
+    result = tuple(_walk_once(occ_pkg_dir, visited))
+    
+    if use_cache:
+        _store_cached_scan(occ_pkg_dir, [d for d, _ in visited],
+                           [m for _, m in visited], result)
+    return result
+
+
+# ==========================================
+# Conda shared libraries
+# ==========================================
+def _lib_search_spec(conda_prefix):
+    """Per-platform (lib_dirs, lib_patterns)"""
+    if is_win:
+        lib_dirs = [
+            os.path.join(conda_prefix, 'Library', 'bin'),
+            os.path.join(conda_prefix, 'Library', 'lib'),
+            os.path.join(conda_prefix, 'bin'),
+        ]
+        lib_patterns = ['TK*.dll', 'freetype*.dll', 'freeimage*.dll', 'tbb*.dll']
+    elif is_darwin:
+        lib_dirs = [os.path.join(conda_prefix, 'lib')]
+        lib_patterns = ['libTK*.dylib', 'libfreeimage*.dylib', 'libfreetype*.dylib']
+    else:
+        lib_dirs = [
+            os.path.join(conda_prefix, 'lib'),
+            os.path.join(conda_prefix, 'lib64'),
+        ]
+        lib_patterns = ['libTK*.so*', 'libfreeimage*.so*', 'libfreetype*.so*']
+    return lib_dirs, lib_patterns
+
+
+def _compile_patterns(patterns):
+    """One regex alternation for a list of glob patterns.
+
+    Each directory entry is matched once in C instead of once per
+    pattern through fnmatch. Windows matching is case-insensitive,
+    like glob on that platform.
+    """
+    flags = re.IGNORECASE if is_win else 0
+    return re.compile('|'.join(fnmatch.translate(p) for p in patterns), flags)
+
+
+@functools.lru_cache(maxsize=None)
+def collect_shared_libraries(conda_prefix):
+    """OCC and helper shared libraries from a conda environment
+
+    Returns:
+        (libs, tk_count, searched_dirs); libs are (src_path, '.') tuples
+    """
+    lib_dirs, lib_patterns = _lib_search_spec(conda_prefix)
+    lib_rx = _compile_patterns(lib_patterns)
+    # Unix conda installs ship each soname as a real file plus symlinks;
+    # only the real file is bundled. DirEntry.is_symlink() reads the
+    # cached d_type, so this costs no extra lstat.
+    skip_symlinks = not is_win
+    
+    libs = []
+    tk_count = 0
+    searched_dirs = []
+    for lib_dir in lib_dirs:
+        # Missing directories show up as an OSError from the single
+        # scandir call, no separate exists() stat is needed.
+        try:
+            with os.scandir(lib_dir) as it:
+                for entry in it:
+                    if not lib_rx.match(entry.name):
+                        continue
+                    if skip_symlinks and entry.is_symlink():
+                        continue
+                    
+                    libs.append((entry.path, '.'))
+                    if entry.name.startswith(('TK', 'libTK', 'tk', 'libtk')):
+                        tk_count += 1
+        except OSError:
+            continue
+        searched_dirs.append(lib_dir)
+    
+    return tuple(libs), tk_count, tuple(searched_dirs)
+
+
+def unique_by_realpath(entries):
+    """Drop (src, dest) entries that alias an earlier one
+
+    Overlapping library directories and symlinks can list the same file
+    several times; PyInstaller would hash and copy each copy.
+    """
+    seen = set()
+    unique = []
+    for src, dest in entries:
+        key = (os.path.normcase(os.path.realpath(src)), dest)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append((src, dest))
+    return unique
@@ -8,10 +8,22 @@ STEP/STP to STL Converter
 """ 
 
 import os
+import re
 import sys
+import copy
+import io
+import json
 import time
+import zlib
+import struct
+import tarfile
 import zipfile
 import argparse
+import contextlib
+import traceback
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional
 
@@ -36,31 +48,705 @@ except ImportError as e:
     print("请运行: pip install pythonocc-core", file=sys.stderr) 
     sys.exit(EXIT_ERROR_IMPORT) 
 
+# OCC 线程池（旧版 pythonocc 可能没有）
+OSD_PARALLEL_AVAILABLE = False
+try: 
+    from OCC.Core.OSD import OSD_Parallel, OSD_ThreadPool
+    OSD_PARALLEL_AVAILABLE = True
+except ImportError: 
+    pass
+
+# 网格参数结构体（OCC 7.5+）
+IMESH_PARAMETERS_AVAILABLE = False
+try: 
+    from OCC.Core.IMeshTools import IMeshTools_Parameters
+    IMESH_PARAMETERS_AVAILABLE = True
+except ImportError: 
+    pass
+
 # 可选依赖检查
-TRIMESH_AVAILABLE = False
+# numpy/numba 只在 --optimize/--glb 时才用到，这里只检查是否安装，
+# 真正的导入推迟到 _import_numpy()，基础转换不承担这部分启动开销
+NUMPY_AVAILABLE = importlib.util.find_spec('numpy') is not None
+np = None
+
+# Numba（可选，用于融合的网格优化内核）
+NUMBA_AVAILABLE = NUMPY_AVAILABLE and importlib.util.find_spec('numba') is not None
+
+# libdeflate（比 zlib 更快的 DEFLATE 实现，可选）
+DEFLATE_AVAILABLE = False
 try: 
-    import trimesh
-    import numpy as np
-    TRIMESH_AVAILABLE = True
+    import deflate
+    DEFLATE_AVAILABLE = True
 except ImportError: 
     pass
 
+# Zstandard（--compressor zstd，可选）
+ZSTD_AVAILABLE = False
+try: 
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError: 
+    pass
+
+# 只有交互式终端才需要立即显示"进行中"的提示；输出被重定向或在子进程中时
+# 交给块缓冲统一写出，省去每个阶段一次 write+flush
+try: 
+    PROGRESS_FLUSH = sys.stdout.isatty()
+except Exception: 
+    PROGRESS_FLUSH = False
+
+# 手写ZIP不支持 Zip64，超过此大小交给 zipfile
+ZIP32_LIMIT = 0xFFFFFFFF
+
+# 大文件流式压缩阈值与分块大小（libdeflate 只有整块API，需把文件整个读入内存）
+ZIP_STREAM_THRESHOLD = 64 * 1024 * 1024
+ZIP_STREAM_CHUNK = 4 * 1024 * 1024
+
+def _zip_entry_meta(arcname, mtime):
+    """ZIP条目的 (文件名字节, 标志位, DOS时间, DOS日期)"""
+    try:
+        name = arcname.encode('ascii')
+        flags = 0
+    except UnicodeEncodeError:
+        # 中文文件名：UTF-8 + 通用标志位 11
+        name = arcname.encode('utf-8')
+        flags = 0x800
+    
+    t = time.localtime(mtime)
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = (max(t.tm_year - 1980, 0) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return name, flags, dos_time, dos_date
+
+def _zip_local_header(meta, crc, compressed_size, size):
+    name, flags, dos_time, dos_date = meta
+    return struct.pack('<4s5H3L2H', b'PK\x03\x04', 20, flags, zipfile.ZIP_DEFLATED,
+                       dos_time, dos_date, crc, compressed_size, size, len(name), 0) + name
+
+def _zip_central_record(meta, crc, compressed_size, size, offset):
+    name, flags, dos_time, dos_date = meta
+    # 外部属性存的是 Unix 权限位，"创建系统"须标为 Unix(3)，否则解压工具会忽略它
+    return struct.pack('<4s6H3L5H2L', b'PK\x01\x02', (3 << 8) | 20, 20, flags,
+                       zipfile.ZIP_DEFLATED, dos_time, dos_date, crc,
+                       compressed_size, size, len(name), 0, 0, 0, 0,
+                       0o100644 << 16, offset) + name
+
+def _zip_finish(f, central):
+    """写中央目录和结束记录"""
+    cd_offset = f.tell()
+    for record in central:
+        f.write(record)
+    cd_size = f.tell() - cd_offset
+    f.write(struct.pack('<4s4H2LH', b'PK\x05\x06', 0, 0, len(central), len(central),
+                        cd_size, cd_offset, 0))
+
+def _write_deflated_zip(zip_path, entries):
+    """
+    把已经压缩好的 raw DEFLATE 数据写成标准ZIP文件
+    
+    Args:
+        zip_path: ZIP输出路径
+        entries: [(arcname, payload, crc, size, mtime)] 列表，
+                 payload 为 raw DEFLATE 数据，size 为原始大小
+    
+    Returns:
+        int: ZIP文件字节数
+    """
+    central = []
+    with open(zip_path, 'wb') as f:
+        for arcname, payload, crc, size, mtime in entries:
+            meta = _zip_entry_meta(arcname, mtime)
+            offset = f.tell()
+            f.write(_zip_local_header(meta, crc, len(payload), size))
+            f.write(payload)
+            central.append(_zip_central_record(meta, crc, len(payload), size, offset))
+        _zip_finish(f, central)
+        return f.tell()
+
+def _precompress(file_path, level):
+    """
+    用 libdeflate 整块压缩一个文件（libdeflate 压缩时释放GIL，可在线程中并行）
+    
+    Returns:
+        (payload, crc, size): raw DEFLATE 数据、CRC32 和原始大小
+    """
+    data = file_path.read_bytes()
+    # libdeflate 的 CRC32 走 PCLMUL 指令，比 zlib 查表快得多
+    return deflate.deflate_compress(data, level), deflate.crc32(data), len(data)
+
+def _write_streamed_zip(zip_path, files, level):
+    """
+    分块流式压缩文件到ZIP（内存占用与文件大小无关）
+    
+    每个条目先写占位的本地文件头，压缩完成后回填 CRC 和大小。
+    
+    Args:
+        zip_path: ZIP输出路径
+        files: [(file_path, mtime)] 列表
+        level: 压缩级别
+    
+    Returns:
+        int: ZIP文件字节数
+    """
+    central = []
+    with open(zip_path, 'wb') as f:
+        for file_path, mtime in files:
+            meta = _zip_entry_meta(file_path.name, mtime)
+            compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+            crc = 0
+            size = 0
+            compressed_size = 0
+            
+            offset = f.tell()
+            if offset >= ZIP32_LIMIT:
+                raise ValueError("压缩数据超过4GB")
+            f.write(_zip_local_header(meta, 0, 0, 0))
+            
+            with open(file_path, 'rb', buffering=0) as src:
+                while True:
+                    chunk = src.read(ZIP_STREAM_CHUNK)
+                    if not chunk:
+                        break
+                    crc = zlib.crc32(chunk, crc)
+                    size += len(chunk)
+                    block = compressor.compress(chunk)
+                    compressed_size += len(block)
+                    f.write(block)
+            block = compressor.flush()
+            compressed_size += len(block)
+            f.write(block)
+            
+            if compressed_size >= ZIP32_LIMIT or size >= ZIP32_LIMIT:
+                raise ValueError("压缩数据超过4GB")
+            
+            end = f.tell()
+            f.seek(offset)
+            f.write(_zip_local_header(meta, crc, compressed_size, size))
+            f.seek(end)
+            central.append(_zip_central_record(meta, crc, compressed_size, size, offset))
+        
+        _zip_finish(f, central)
+        return f.tell()
+
+# int32 可表示的最大网格坐标/索引
+INT32_MAX = 2 ** 31 - 1
+
+def _narrow_int(values):
+    """整数数组在 int32 范围内时转为 int32（打包后的键更短，排序更快）"""
+    if len(values) == 0 or (values.max() <= INT32_MAX and values.min() >= -INT32_MAX):
+        return values.astype(np.int32)
+    return values.astype(np.int64)
+
+def _pack_rows(rows):
+    """
+    把二维数组的每一行视为一个不透明字节串（void 元素）
+    
+    np.unique 对 void 元素按 memcmp 排序，比结构化 dtype 的逐字段比较快约3倍。
+    """
+    rows = np.ascontiguousarray(rows)
+    return rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).reshape(-1)
+
+def _weld_vertices(vertices, faces, tol):
+    """
+    哈希焊接重复顶点（替代 trimesh.merge_vertices）
+    
+    顶点按 tol 量化为整数网格坐标（范围允许时用 int32），每行打包成一个
+    void 元素后用 np.unique 一次去重，再用 inverse 重映射三角面索引。
+    
+    Args:
+        vertices: (N, 3) 顶点数组
+        faces: (M, 3) 三角面索引
+        tol: 焊接容差（绝对长度）
+        
+    Returns:
+        (vertices, faces): 去重后的顶点和重映射后的三角面
+    """
+    grid = _narrow_int(np.round(vertices / tol))
+    _, first, inverse = np.unique(_pack_rows(grid), return_index=True, return_inverse=True)
+    # np.take 比花式索引少一层通用索引开销；inverse 为 intp，无需转换类型
+    return vertices[first], np.take(inverse.reshape(-1), faces)
+
+def _merge_identical_vertices(vertices):
+    """
+    合并坐标完全相同的顶点（无损：三角面和坐标都不变）
+    
+    Args:
+        vertices: (N*3, 3) 三角面汤顶点，每3个为一个三角面
+        
+    Returns:
+        (vertices, faces): 去重后的顶点和对应的三角面索引
+    """
+    _, first, inverse = np.unique(_pack_rows(vertices), return_index=True, return_inverse=True)
+    return vertices[first], inverse.reshape(-1, 3)
+
+def _remove_unreferenced(vertices, faces):
+    """
+    移除没有被任何三角面引用的顶点（替代 trimesh.remove_unreferenced_vertices）
+    
+    Returns:
+        (vertices, faces): 压缩后的顶点和重映射后的三角面
+    """
+    used = np.zeros(len(vertices), dtype=bool)
+    used[faces.reshape(-1)] = True
+    if used.all():
+        return vertices, faces
+    remap = np.cumsum(used) - 1
+    return vertices[used], np.take(remap, faces)
+
+def _nondegenerate_mask(vertices, faces, min_area):
+    """
+    向量化的退化三角面检测
+    
+    同时排除两个索引相同的三角面和面积小于 min_area 的三角面。
+    
+    Returns:
+        np.ndarray: 布尔掩码，True 表示保留
+    """
+    same_index = (faces[:, 0] == faces[:, 1]) | (faces[:, 1] == faces[:, 2]) | (faces[:, 0] == faces[:, 2])
+    v0 = vertices[faces[:, 0]]
+    normals = np.cross(vertices[faces[:, 1]] - v0, vertices[faces[:, 2]] - v0)
+    # |cross| 为面积的两倍，比较平方值避免开方
+    double_area_sq = np.einsum('ij,ij->i', normals, normals)
+    return (double_area_sq > 4.0 * min_area * min_area) & ~same_index
+
+def _unique_face_indices(faces):
+    """
+    向量化的重复三角面检测
+    
+    每行索引先排序（顶点顺序/朝向不同的同一三角面视为重复），
+    再按行打包后用 np.unique 去重。
+    
+    Returns:
+        np.ndarray: 保留的三角面下标（保持原顺序）
+    """
+    canonical = np.sort(_narrow_int(faces), axis=1)
+    _, keep = np.unique(_pack_rows(canonical), return_index=True)
+    return np.sort(keep)
+
+def _import_numpy():
+    """首次需要网格处理时导入 numpy，并在有 numba 时编译内核"""
+    global np, NUMBA_AVAILABLE
+    if np is None:
+        import numpy
+        np = numpy
+        if NUMBA_AVAILABLE:
+            try:
+                _define_numba_kernels()
+            except Exception:
+                # 不只是缺少 numba：打包后的程序里 cache=True 找不到缓存目录时
+                # numba 会抛 RuntimeError。任何失败都退回纯 NumPy 实现
+                NUMBA_AVAILABLE = False
+    return np
+
+def _define_numba_kernels():
+    global numba, _grid_keys, _fused_optimize, _face_normals_kernel
+    import numba
+    
+    @numba.njit(parallel=True, cache=True)
+    def _grid_keys(vertices, tol):
+        """并行把顶点坐标量化为整数网格坐标"""
+        n = vertices.shape[0]
+        keys = np.empty((n, 3), dtype=np.int64)
+        for i in numba.prange(n):
+            for d in range(3):
+                keys[i, d] = np.int64(np.rint(vertices[i, d] / tol))
+        return keys
+    
+    @numba.njit(cache=True)
+    def _triple_hash(x, y, z, mask):
+        """整数三元组的乘法哈希（溢出按补码回绕）"""
+        h = x * np.int64(-7046029254386353131)
+        h = (h ^ y) * np.int64(-4417276706812531889)
+        h = (h ^ z) * np.int64(1609587929392839161)
+        return (h ^ (h >> 32)) & mask
+    
+    @numba.njit(cache=True)
+    def _table_mask(n):
+        """开放寻址表大小取不小于 2n 的2的幂，返回掩码"""
+        size = 16
+        while size < 2 * n:
+            size *= 2
+        return size - 1
+    
+    @numba.njit(cache=True)
+    def _fused_optimize(vertices, faces, tol, min_double_area_sq):
+        """
+        一次遍历完成焊接、退化面和重复面剔除（与 NumPy 分步结果等价）
+        
+        顶点先按网格坐标哈希到首次出现的顶点；随后单次扫描三角面，
+        同时做退化检测、排序三元组去重，并只输出被保留三角面引用的顶点。
+        哈希表是线性探测的开放寻址数组，插入必须保持首次出现的顺序，
+        因此只有量化步骤是并行的。
+        """
+        n = vertices.shape[0]
+        m = faces.shape[0]
+        
+        keys = _grid_keys(vertices, tol)
+        mask = _table_mask(n)
+        table = np.full(mask + 1, -1, dtype=np.int64)
+        canonical = np.empty(n, dtype=np.int64)
+        for i in range(n):
+            slot = _triple_hash(keys[i, 0], keys[i, 1], keys[i, 2], mask)
+            while True:
+                j = table[slot]
+                if j < 0:
+                    table[slot] = i
+                    canonical[i] = i
+                    break
+                if keys[j, 0] == keys[i, 0] and keys[j, 1] == keys[i, 1] and keys[j, 2] == keys[i, 2]:
+                    canonical[i] = j
+                    break
+                slot = (slot + 1) & mask
+        
+        face_mask = _table_mask(m)
+        face_table = np.full(face_mask + 1, -1, dtype=np.int64)
+        sorted_faces = np.empty((m, 3), dtype=np.int64)
+        out_index = np.full(n, -1, dtype=np.int64)
+        out_vertices = np.empty((n, 3), dtype=np.float64)
+        out_faces = np.empty((m, 3), dtype=np.int64)
+        nv = 0
+        nf = 0
+        for k in range(m):
+            a = canonical[faces[k, 0]]
+            b = canonical[faces[k, 1]]
+            c = canonical[faces[k, 2]]
+            if a == b or b == c or a == c:
+                continue
+            
+            ux = vertices[b, 0] - vertices[a, 0]
+            uy = vertices[b, 1] - vertices[a, 1]
+            uz = vertices[b, 2] - vertices[a, 2]
+            vx = vertices[c, 0] - vertices[a, 0]
+            vy = vertices[c, 1] - vertices[a, 1]
+            vz = vertices[c, 2] - vertices[a, 2]
+            nx = uy * vz - uz * vy
+            ny = uz * vx - ux * vz
+            nz = ux * vy - uy * vx
+            if nx * nx + ny * ny + nz * nz <= min_double_area_sq:
+                continue
+            
+            lo = min(a, b, c)
+            hi = max(a, b, c)
+            mid = a + b + c - lo - hi
+            slot = _triple_hash(lo, mid, hi, face_mask)
+            duplicate = False
+            while True:
+                j = face_table[slot]
+                if j < 0:
+                    face_table[slot] = nf
+                    break
+                if sorted_faces[j, 0] == lo and sorted_faces[j, 1] == mid and sorted_faces[j, 2] == hi:
+                    duplicate = True
+                    break
+                slot = (slot + 1) & face_mask
+            if duplicate:
+                continue
+            sorted_faces[nf, 0] = lo
+            sorted_faces[nf, 1] = mid
+            sorted_faces[nf, 2] = hi
+            
+            for col in range(3):
+                v = a if col == 0 else (b if col == 1 else c)
+                if out_index[v] < 0:
+                    out_index[v] = nv
+                    out_vertices[nv] = vertices[v]
+                    nv += 1
+                out_faces[nf, col] = out_index[v]
+            nf += 1
+        
+        return out_vertices[:nv].copy(), out_faces[:nf].copy()
+    
+    @numba.njit(parallel=True, cache=True)
+    def _face_normals_kernel(vertices, faces):
+        """单次遍历求单位法向量，中间量留在寄存器里"""
+        m = faces.shape[0]
+        normals = np.empty((m, 3), dtype=np.float32)
+        for k in numba.prange(m):
+            a = faces[k, 0]
+            b = faces[k, 1]
+            c = faces[k, 2]
+            ux = vertices[b, 0] - vertices[a, 0]
+            uy = vertices[b, 1] - vertices[a, 1]
+            uz = vertices[b, 2] - vertices[a, 2]
+            vx = vertices[c, 0] - vertices[a, 0]
+            vy = vertices[c, 1] - vertices[a, 1]
+            vz = vertices[c, 2] - vertices[a, 2]
+            nx = uy * vz - uz * vy
+            ny = uz * vx - ux * vz
+            nz = ux * vy - uy * vx
+            length = np.sqrt(nx * nx + ny * ny + nz * nz)
+            inv = 1.0 / length if length > 0.0 else 0.0
+            normals[k, 0] = nx * inv
+            normals[k, 1] = ny * inv
+            normals[k, 2] = nz * inv
+        return normals
+
+def _read_stl_binary(path):
+    """
+    把二进制STL的 50 字节记录内存映射为结构化数组
+    
+    记录不经过用户态缓冲区，由系统按需分页读入，
+    峰值内存只有转换出的 float64 顶点数组。
+    
+    Returns:
+        (N*3, 3) float64 三角形顶点（每个三角面3个独立顶点），无效文件返回None
+    """
+    record_dtype = np.dtype([('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('attr', '<u2')])
+    
+    with open(path, 'rb') as f:
+        header = f.read(84)
+        if len(header) < 84:
+            return None
+        count = struct.unpack('<I', header[80:84])[0]
+        if os.fstat(f.fileno()).st_size != 84 + count * record_dtype.itemsize:
+            return None
+    if count == 0:
+        return np.empty((0, 3), dtype=np.float64)
+    
+    records = np.memmap(path, dtype=record_dtype, mode='r', offset=84, shape=(count,))
+    vertices = records['vertices'].reshape(-1, 3).astype(np.float64)
+    # 立即释放映射，否则 Windows 上无法用临时文件替换该STL
+    del records
+    return vertices
+
+# ASCII STL 顶点行中 vertex 关键字之后的部分（锚定行首，
+# 避免匹配到 solid/endsolid 名称里的 "vertex"）
+_STL_VERTEX_RE = re.compile(rb'^[ \t]*vertex[ \t]+([^\n]*)', re.M)
+
+def _read_stl_ascii(path):
+    """
+    解析ASCII STL，只提取 vertex 行的坐标
+    
+    Returns:
+        (N*3, 3) float64 三角形顶点
+    """
+    # 直接在字节上匹配，省去整文件解码为 str；坐标拼接后交给 NumPy 的 C 解析循环，
+    # 不为每个数字创建 Python 对象
+    matches = _STL_VERTEX_RE.findall(Path(path).read_bytes())
+    values = np.fromstring(b' '.join(matches), dtype=np.float64, sep=' ')
+    # 旧版 NumPy 遇到无法解析的内容只会警告并截断，这里按数量校验
+    if len(values) != 3 * len(matches):
+        raise ValueError("ASCII STL 顶点行格式无效")
+    vertices = values.reshape(-1, 3)
+    return vertices[:len(vertices) - len(vertices) % 3]
+
+def _unique_triangle_indices(vertices, faces, tol):
+    """
+    按量化坐标检测重复三角面（不焊接顶点，适用于STL三角面汤）
+    
+    每个三角面的3个顶点网格坐标按字典序排序后整体打包，再用 np.unique 去重。
+    
+    Returns:
+        np.ndarray: 保留的三角面下标（保持原顺序）
+    """
+    grid = _narrow_int(np.round(vertices / tol))
+    corners = np.ascontiguousarray(grid).view([('x', grid.dtype), ('y', grid.dtype), ('z', grid.dtype)]).reshape(-1)
+    # 结构化数组排序即按 (x, y, z) 字典序
+    triangles = np.sort(corners[faces], axis=1)
+    _, keep = np.unique(_pack_rows(triangles), return_index=True)
+    return np.sort(keep)
+
+def _face_normals(vertices, faces, triangles=None):
+    """
+    三角面单位法向量（float32，零面积面为0向量）
+    
+    有 Numba 时走融合内核；否则用预分配的缓冲区原地计算，减少临时数组。
+    """
+    if NUMBA_AVAILABLE:
+        return _face_normals_kernel(vertices, faces)
+    
+    if triangles is None:
+        triangles = vertices[faces]
+    e1 = np.subtract(triangles[:, 1], triangles[:, 0])
+    e2 = np.subtract(triangles[:, 2], triangles[:, 0], out=np.empty_like(e1))
+    normals = np.cross(e1, e2)
+    lengths = np.sqrt(np.einsum('ij,ij->i', normals, normals))
+    lengths[lengths == 0] = 1.0
+    np.divide(normals, lengths[:, None], out=normals)
+    return normals.astype(np.float32)
+
+# 二进制STL分块写出的三角面数（每块约50MB记录 + 同等规模的临时数组）
+STL_WRITE_CHUNK = 1 << 20
+
+def _write_stl_binary(path, vertices, faces):
+    """
+    用 NumPy 结构化数组分块写出二进制STL
+    
+    每个三角面是 50 字节的记录（法向量 + 3个顶点 + 属性字），
+    每块记录组装好后通过一次 tofile 写入；峰值内存与块大小有关，
+    与网格总大小无关。
+    
+    Returns:
+        int: 写入的字节数
+    """
+    record_dtype = np.dtype([('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('attr', '<u2')])
+    count = len(faces)
+    
+    with open(path, 'wb') as f:
+        # 文件头不能以 "solid" 开头，否则会被误判为ASCII STL
+        f.write(b'binary STL written by step2stl'.ljust(80, b' '))
+        f.write(np.uint32(count).tobytes())
+        
+        records = np.zeros(min(count, STL_WRITE_CHUNK), dtype=record_dtype)
+        for start in range(0, count, STL_WRITE_CHUNK):
+            chunk = faces[start:start + STL_WRITE_CHUNK]
+            block = records[:len(chunk)]
+            triangles = vertices[chunk]
+            block['normal'] = _face_normals(vertices, chunk, triangles)
+            block['vertices'] = triangles
+            block.tofile(f)
+    return 84 + count * record_dtype.itemsize
+
+# 16位量化坐标的最大网格值
+GLB_QUANT_STEPS = 65535
+
+def _write_glb(path, vertices, faces, quantize=False):
+    """
+    直接写出单网格GLB（glTF 2.0 二进制），不经过 trimesh 导出
+    
+    BIN 块依次存放顶点和 uint32 索引，JSON 块只描述一个 primitive。
+    quantize=True 时按包围盒把顶点量化为 uint16（KHR_mesh_quantization），
+    由节点的平移/缩放还原真实坐标。
+    
+    Returns:
+        int: 写入的字节数
+    """
+    indices = np.ascontiguousarray(faces, dtype='<u4')
+    node = {'mesh': 0}
+    
+    if quantize and len(vertices): 
+        bbox_min = vertices.min(axis=0)
+        scale = (vertices.max(axis=0) - bbox_min) / GLB_QUANT_STEPS
+        scale[scale == 0] = 1.0
+        # 顶点属性步长须为4的倍数：xyz 后补一个 uint16
+        positions = np.zeros((len(vertices), 4), dtype='<u2')
+        positions[:, :3] = np.rint((vertices - bbox_min) / scale)
+        position_accessor = {
+            'bufferView': 0, 'componentType': 5123, 'count': len(positions), 'type': 'VEC3',
+            'min': positions[:, :3].min(axis=0).tolist(),
+            'max': positions[:, :3].max(axis=0).tolist(),
+        }
+        position_view = {'byteStride': 8}
+        node['translation'] = bbox_min.tolist()
+        node['scale'] = scale.tolist()
+    else: 
+        positions = np.ascontiguousarray(vertices, dtype='<f4')
+        position_accessor = {
+            'bufferView': 0, 'componentType': 5126, 'count': len(positions), 'type': 'VEC3',
+            # POSITION 必须给出 min/max
+            'min': positions.min(axis=0).tolist() if len(positions) else [0.0, 0.0, 0.0],
+            'max': positions.max(axis=0).tolist() if len(positions) else [0.0, 0.0, 0.0],
+        }
+        position_view = {}
+    
+    position_bytes = positions.nbytes
+    index_bytes = indices.nbytes
+    position_view.update({'buffer': 0, 'byteOffset': 0, 'byteLength': position_bytes, 'target': 34962})
+    
+    gltf = {
+        'asset': {'version': '2.0', 'generator': 'step2stl'},
+        'scene': 0,
+        'scenes': [{'nodes': [0]}],
+        'nodes': [node],
+        'meshes': [{'primitives': [{'attributes': {'POSITION': 0}, 'indices': 1, 'mode': 4}]}],
+        'accessors': [
+            position_accessor,
+            {'bufferView': 1, 'componentType': 5125, 'count': indices.size, 'type': 'SCALAR'},
+        ],
+        'bufferViews': [
+            position_view,
+            {'buffer': 0, 'byteOffset': position_bytes, 'byteLength': index_bytes, 'target': 34963},
+        ],
+        'buffers': [{'byteLength': position_bytes + index_bytes}],
+    }
+    if 'scale' in node: 
+        gltf['extensionsUsed'] = ['KHR_mesh_quantization']
+        gltf['extensionsRequired'] = ['KHR_mesh_quantization']
+    
+    # 两个块都要 4 字节对齐：JSON 用空格补齐，BIN 用 0 补齐
+    json_chunk = json.dumps(gltf, separators=(',', ':')).encode('utf-8')
+    json_chunk += b' ' * (-len(json_chunk) % 4)
+    bin_padding = -(position_bytes + index_bytes) % 4
+    bin_length = position_bytes + index_bytes + bin_padding
+    total_length = 12 + 8 + len(json_chunk) + 8 + bin_length
+    
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<4sLL', b'glTF', 2, total_length))
+        f.write(struct.pack('<LL', len(json_chunk), 0x4E4F534A))
+        f.write(json_chunk)
+        f.write(struct.pack('<LL', bin_length, 0x004E4942))
+        positions.tofile(f)
+        indices.tofile(f)
+        f.write(b'\x00' * bin_padding)
+    return total_length
+
+_occt_threads_configured = False
+
+def _configure_occt_threads():
+    """
+    让 BRepMesh 的并行模式使用 OCCT 自带线程池，线程数取CPU核数
+    
+    没有TBB的OCC构建只有打开此开关才会真正并行；每个进程只设置一次。
+    """
+    global _occt_threads_configured
+    if _occt_threads_configured or not OSD_PARALLEL_AVAILABLE:
+        return
+    _occt_threads_configured = True
+    try:
+        OSD_Parallel.SetUseOcctThreads(True)
+        # 默认线程池在第一次调用时按给定线程数创建
+        OSD_ThreadPool.DefaultPool(os.cpu_count() or 1)
+    except Exception:
+        pass
+
+def _convert_file_worker(converter, args):
+    """
+    进程池任务：在子进程中转换单个文件（converter 仅含简单属性，可直接pickle）
+    
+    子进程的输出先收集起来，由主进程按文件整块打印，避免多个进程的进度行交错。
+    stdout 与 stderr 分开收集，错误信息仍写到主进程的 stderr。
+    
+    Returns:
+        (bool, str, str): 是否成功，以及该文件的 stdout 和 stderr 输出
+    """
+    out = io.StringIO()
+    err = io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            ok = converter.convert_file(*args)
+        except Exception as e:
+            print(f"❌ 错误: 转换失败 - {args[0]}: {e}", file=sys.stderr)
+            ok = False
+    return ok, out.getvalue(), err.getvalue()
+
 class StepToStlConverter: 
     """STEP/STP 到 STL 转换器""" 
     
-    SUPPORTED_EXTENSIONS = ['.step', '.stp', '.STEP', '.STP'] 
+    # 支持的后缀（小写，比较前先转小写）
+    SUPPORTED_EXTENSIONS = ('.step', '.stp') 
     
-    # 质量预设（优化后的参数）
+    # 质量预设（优化后的参数）：(线性偏差, 角度偏差, 名称)
     QUALITY_PRESETS = { 
-        'draft': {'linear': 0.1, 'angular': 1.0, 'name': '草图'}, 
-        'low': {'linear': 0.05, 'angular': 0.8, 'name': '低质量'}, 
-        'medium': {'linear': 0.01, 'angular': 0.5, 'name': '中等质量'}, 
-        'high': {'linear': 0.005, 'angular': 0.3, 'name': '高质量'}, 
-        'ultra': {'linear': 0.001, 'angular': 0.1, 'name': '超高质量'} 
+        'draft': (0.1, 1.0, '草图'), 
+        'low': (0.05, 0.8, '低质量'), 
+        'medium': (0.01, 0.5, '中等质量'), 
+        'high': (0.005, 0.3, '高质量'), 
+        'ultra': (0.001, 0.1, '超高质量') 
     } 
     
+    # Zstandard 压缩级别（多线程下仍明显快于 DEFLATE 9，且体积更小）
+    ZSTD_LEVEL = 15
+    
+    # 顶点焊接容差（相对于实际线性偏差）
+    WELD_TOLERANCE_RATIO = 1e-3
+    
+    # GLB 16位量化：量化步长不超过线性偏差的该比例时才启用
+    GLB_QUANTIZE_RATIO = 0.01
+    
     def __init__(self, quality='low', linear_deflection=None, 
-                 angular_deflection=None, relative=True, parallel=True): 
+                 angular_deflection=None, relative=True, parallel=True, 
+                 native_relative=False, compress_level=6, compressor='deflate',
+                 allow_quality_decrease=False, glb_quantize=False): 
         """ 
         初始化转换器
         
@@ -70,22 +756,115 @@ class StepToStlConverter:
             angular_deflection: 角度偏差（覆盖预设） 
             relative: 是否使用相对误差（推荐） 
             parallel: 是否启用并行处理（推荐）
+            native_relative: 相对误差交给OCC内部计算（按每条边/面的尺寸，
+                             跳过Python侧的包围盒计算，网格会更细）
+            compress_level: ZIP压缩级别 1-9（6 为速度与压缩率的平衡点，
+                            9 只多压缩不到1%，耗时却是2-3倍）
+            compressor: 压缩格式，'deflate' 输出ZIP，'zstd' 输出 .zst/.tar.zst
+                        （需要 zstandard，压缩更快、体积更小）
+            allow_quality_decrease: 允许OCC在难以满足精度的面上放宽偏差
+                                    （更快，但网格可能超出要求的精度，OCC 7.5+）
+            glb_quantize: GLB顶点量化为 uint16（KHR_mesh_quantization，体积更小，
+                          但查看器必须支持该扩展才能打开）
         """ 
-        if quality in self.QUALITY_PRESETS: 
-            preset = self.QUALITY_PRESETS[quality] 
-            self.linear_deflection = linear_deflection or preset['linear'] 
-            self.angular_deflection = angular_deflection or preset['angular'] 
-            self.quality_name = preset['name'] 
+        preset = self.QUALITY_PRESETS.get(quality)
+        if preset is not None: 
+            preset_linear, preset_angular, self.quality_name = preset
         else: 
-            self.linear_deflection = linear_deflection or 0.05
-            self.angular_deflection = angular_deflection or 0.8
-            self.quality_name = '自定义' 
+            preset_linear, preset_angular, self.quality_name = 0.05, 0.8, '自定义'
+        self.linear_deflection = linear_deflection or preset_linear
+        self.angular_deflection = angular_deflection or preset_angular
         
         self.relative = relative
         self.parallel = parallel  # 并行处理标志
+        self.native_relative = native_relative
+        self.compress_level = compress_level
+        self.compressor = compressor
+        self.allow_quality_decrease = allow_quality_decrease
+        self.glb_quantize = glb_quantize
+        self._bbox_cache = None  # (shape, 结果)，持有shape引用保证id不被复用
+        self._stl_writer = None  # 批量转换时复用的 StlAPI_Writer
+        self._stl_writer_ascii = None
+        self._step_reader = None  # 批量转换时复用的 STEPControl_Reader
+        self._file_sizes = {}  # 输出文件字节数（写入时记录，避免反复 stat）
+    
+    def __getstate__(self): 
+        # OCC对象无法pickle，传给子进程时丢弃，由子进程按需重建
+        state = self.__dict__.copy()
+        state['_bbox_cache'] = None
+        state['_stl_writer'] = None
+        state['_stl_writer_ascii'] = None
+        state['_step_reader'] = None
+        state['_file_sizes'] = {}
+        return state
+    
+    def get_stl_writer(self, ascii_mode): 
+        """获取复用的STL写入器（只在模式变化时重新设置）""" 
+        if self._stl_writer is None: 
+            self._stl_writer = StlAPI_Writer()
+        if self._stl_writer_ascii != ascii_mode: 
+            self._stl_writer.SetASCIIMode(ascii_mode)
+            self._stl_writer_ascii = ascii_mode
+        return self._stl_writer
+    
+    def get_step_reader(self): 
+        """获取复用的STEP读取器（会话、模式表和单位表只初始化一次）""" 
+        if self._step_reader is None: 
+            self._step_reader = STEPControl_Reader()
+        else: 
+            self._step_reader.ClearShapes()
+        return self._step_reader
+    
+    def _release_step_reader(self): 
+        """释放读取器持有的上一个STEP模型；清理失败时直接丢弃读取器""" 
+        if self._step_reader is None: 
+            return
+        try: 
+            self._step_reader.ClearShapes()
+            self._step_reader.WS().ClearData(1)
+        except Exception: 
+            self._step_reader = None
+    
+    def _file_size(self, path: Path) -> int: 
+        """文件字节数：优先使用写入时记录的值""" 
+        size = self._file_sizes.get(path)
+        if size is None: 
+            size = path.stat().st_size
+            self._file_sizes[path] = size
+        return size
+    
+    def build_mesher(self, shape, deflection, relative): 
+        """ 
+        创建 BRepMesh_IncrementalMesh（构造时即完成网格化）
+        
+        OCC 7.5+ 使用 IMeshTools_Parameters（MinSize 保持OCC默认的
+        0.1 × 偏差），可选允许在难以满足精度的面上降低质量；旧版本退回
+        (shape, 偏差, 是否相对, 角度, 是否并行) 构造函数。
+        """ 
+        if IMESH_PARAMETERS_AVAILABLE: 
+            params = IMeshTools_Parameters()
+            params.Deflection = deflection
+            params.Angle = self.angular_deflection
+            params.Relative = relative
+            params.InParallel = self.parallel
+            # 默认关闭：开启后OCC可能悄悄超出要求的偏差
+            params.AllowQualityDecrease = self.allow_quality_decrease
+            return BRepMesh_IncrementalMesh(shape, params)
+        
+        # 最后一个参数 isInParallel 必须保留，否则OCC按面串行网格化
+        return BRepMesh_IncrementalMesh(
+            shape,
+            deflection,
+            relative,
+            self.angular_deflection,
+            self.parallel
+        )
     
     def get_bounding_box_size(self, shape): 
-        """获取模型包围盒尺寸""" 
+        """获取模型包围盒尺寸（同一shape只遍历一次）""" 
+        if self._bbox_cache is not None and self._bbox_cache[0] is shape: 
+            return self._bbox_cache[1]
+        
         bbox = Bnd_Box() 
         brepbndlib_Add(shape, bbox) 
         xmin, ymin, zmin, xmax, ymax, zmax = bbox.Get() 
@@ -95,6 +874,7 @@ class StepToStlConverter:
         dz = zmax - zmin
         
         max_dim = max(dx, dy, dz) 
+        self._bbox_cache = (shape, (max_dim, (dx, dy, dz)))
         return max_dim, (dx, dy, dz) 
     
     def calculate_deflection(self, shape, quality_factor=0.05): 
@@ -119,84 +899,129 @@ class StepToStlConverter:
         
         return deflection, max_dim, dimensions
     
-    def optimize_stl(self, stl_path: Path) -> Optional[Path]: 
+    def load_stl(self, stl_path: Path, merge=False): 
         """ 
-        优化STL文件（去除重复顶点，减小文件） 
+        加载STL网格（优化与GLB导出共用同一份内存网格） 
         
         Args: 
             stl_path: STL文件路径
+            merge: 是否无损合并完全重合的顶点（不做 optimize_stl 焊接时，
+                   可把GLB的顶点缓冲区缩小到约1/6）
             
         Returns: 
-            Path: 优化后的文件路径，失败返回None
+            (vertices, faces): 顶点和三角面数组，失败返回None
         """ 
-        if not TRIMESH_AVAILABLE: 
-            print("⚠️  警告: 未安装trimesh，跳过优化", file=sys.stderr) 
-            print("   安装命令: pip install trimesh", file=sys.stderr) 
+        if not NUMPY_AVAILABLE: 
             return None
+        _import_numpy()
         
         try: 
-            print("🔧 [优化] 加载STL网格...", end='', flush=True) 
-            original_size = stl_path.stat().st_size / (1024 * 1024) 
-            
-            # 加载STL（使用process=False避免自动处理）
-            mesh = trimesh.load_mesh(str(stl_path), process=False) 
+            print("📥 [网格] 加载STL网格...", end='', flush=PROGRESS_FLUSH) 
+            # 二进制STL内存映射成记录数组；大小对不上时按ASCII解析
+            vertices = _read_stl_binary(stl_path)
+            if vertices is None: 
+                vertices = _read_stl_ascii(stl_path)
+            if merge: 
+                vertices, faces = _merge_identical_vertices(vertices)
+            else: 
+                # 与原始STL一致：每个三角面独立的3个顶点，焊接交给 optimize_stl
+                faces = np.arange(len(vertices), dtype=np.int64).reshape(-1, 3)
             print(" ✓") 
+            return vertices, faces
+        except Exception as e: 
+            print(f"\n⚠️  警告: STL加载失败 - {str(e)}", file=sys.stderr) 
+            return None
+    
+    def optimize_stl(self, mesh, stl_path: Path, deflection=None, weld=True): 
+        """ 
+        优化STL网格（去除重复顶点，减小文件）并写回 stl_path
+        
+        Args: 
+            mesh: load_stl 加载的网格
+            stl_path: STL文件路径
+            deflection: 网格化时实际使用的线性偏差（可选，省略时按网格尺寸估算）
+            weld: 是否合并顶点。二进制STL每个三角面都存完整坐标，
+                  只输出STL时合并顶点不会减小文件，可以跳过
             
-            # 统计原始信息
-            original_vertices = len(mesh.vertices) 
-            original_faces = len(mesh.faces) 
+        Returns: 
+            (vertices, faces): 优化后的网格，失败返回None
+        """ 
+        if not NUMPY_AVAILABLE: 
+            print("⚠️  警告: 未安装numpy，跳过优化", file=sys.stderr) 
+            print("   安装命令: pip install numpy", file=sys.stderr) 
+            return None
+        _import_numpy()
+        
+        try: 
+            original_size = self._file_size(stl_path) / (1024 * 1024) 
             
-            print(f"🔧 [优化] 原始网格: {original_vertices:,} 顶点, {original_faces:,} 三角面") 
+            # 全程直接操作连续的 NumPy 数组
+            vertices = np.ascontiguousarray(mesh[0], dtype=np.float64)
+            faces = np.ascontiguousarray(mesh[1], dtype=np.int64)
             
-            # 1. 合并重复顶点（最主要的优化）
-            print("🔧 [优化] 合并重复顶点...", end='', flush=True) 
-            mesh.merge_vertices() 
-            print(" ✓") 
+            # 统计原始信息
+            original_vertices = len(vertices) 
+            original_faces = len(faces) 
             
-            # 2. 移除未引用的顶点
-            print("🔧 [优化] 清理未使用顶点...", end='', flush=True) 
-            mesh.remove_unreferenced_vertices() 
-            print(" ✓") 
+            print(f"🔧 [优化] 原始网格: {original_vertices:,} 顶点, {original_faces:,} 三角面") 
             
-            # 3. 移除退化面（使用新API）
-            print("🔧 [优化] 清理无效面...", end='', flush=True) 
-            if hasattr(mesh, 'nondegenerate_faces'):
-                # 新版本 API
-                mesh.update_faces(mesh.nondegenerate_faces())
-            elif hasattr(mesh, 'remove_degenerate_faces'):
-                # 旧版本 API（已弃用但还能用）
-                import warnings
-                with warnings.catch_warnings():
-                    warnings.simplefilter("ignore", DeprecationWarning)
-                    mesh.remove_degenerate_faces()
-            else:
-                # 手动过滤
-                valid_faces = mesh.area_faces > 1e-10
-                if not all(valid_faces):
-                    mesh.update_faces(valid_faces)
-            print(" ✓") 
+            if deflection is None: 
+                max_dim = float(np.ptp(vertices, axis=0).max()) if len(vertices) > 0 else 0.0
+                deflection = self.linear_deflection * max_dim if self.relative else self.linear_deflection
+            tol = max(deflection * self.WELD_TOLERANCE_RATIO, 1e-12)
+            # 面积阈值取焊接容差的平方，随网格偏差缩放（相对模式下即随模型尺寸缩放）
+            min_area = tol * tol
             
-            # 4. 移除重复面（使用新API）
-            print("🔧 [优化] 去除重复面...", end='', flush=True) 
-            if hasattr(mesh, 'unique_faces'):
-                # 新版本 API
-                mesh.update_faces(mesh.unique_faces())
-            elif hasattr(mesh, 'remove_duplicate_faces'):
-                # 旧版本 API（已弃用但还能用）
-                import warnings
-                with warnings.catch_warnings():
-                    warnings.simplefilter("ignore", DeprecationWarning)
-                    mesh.remove_duplicate_faces()
-            else:
-                # 手动去重
-                unique_faces = trimesh.grouping.unique_rows(mesh.faces)[0]
-                if len(unique_faces) < len(mesh.faces):
-                    mesh.update_faces(mesh.faces[unique_faces])
-            print(" ✓") 
+            if not weld: 
+                # 只输出STL：跳过顶点合并，直接按坐标剔除退化面和重复面
+                print("🔧 [优化] 清理无效面...", end='') 
+                valid_faces = _nondegenerate_mask(vertices, faces, min_area)
+                if not valid_faces.all():
+                    faces = faces[valid_faces]
+                print(" ✓") 
+                
+                print("🔧 [优化] 去除重复面...", end='') 
+                keep_faces = _unique_triangle_indices(vertices, faces, tol)
+                if len(keep_faces) < len(faces):
+                    faces = faces[keep_faces]
+                vertices, faces = _remove_unreferenced(vertices, faces)
+                print(" ✓") 
+            elif NUMBA_AVAILABLE: 
+                # 🚀 Numba 融合内核：焊接/退化面/重复面一次完成
+                print("🔧 [优化] 合并顶点并清理无效面、重复面...", end='') 
+                vertices, faces = _fused_optimize(vertices, faces, tol, 4.0 * min_area * min_area)
+                print(" ✓") 
+            else: 
+                # 1. 合并重复顶点（最主要的优化）
+                print("🔧 [优化] 合并重复顶点...", end='') 
+                if len(vertices) > 0:
+                    vertices, faces = _weld_vertices(vertices, faces, tol)
+                print(" ✓") 
+                
+                # 2. 移除未引用的顶点
+                print("🔧 [优化] 清理未使用顶点...", end='') 
+                vertices, faces = _remove_unreferenced(vertices, faces)
+                print(" ✓") 
+                
+                # 3. 移除退化面（使用新API）
+                print("🔧 [优化] 清理无效面...", end='') 
+                valid_faces = _nondegenerate_mask(vertices, faces, min_area)
+                if not valid_faces.all():
+                    faces = faces[valid_faces]
+                print(" ✓") 
+                
+                # 4. 移除重复面（使用新API）
+                print("🔧 [优化] 去除重复面...", end='') 
+                keep_faces = _unique_face_indices(faces)
+                if len(keep_faces) < len(faces):
+                    faces = faces[keep_faces]
+                # 删面后可能留下孤立顶点
+                vertices, faces = _remove_unreferenced(vertices, faces)
+                print(" ✓") 
             
             # 统计优化后信息
-            optimized_vertices = len(mesh.vertices) 
-            optimized_faces = len(mesh.faces) 
+            optimized_vertices = len(vertices) 
+            optimized_faces = len(faces) 
             
             vertex_reduction = (1 - optimized_vertices / original_vertices) * 100 if original_vertices > 0 else 0
             face_reduction = (1 - optimized_faces / original_faces) * 100 if original_faces > 0 else 0
@@ -205,35 +1030,36 @@ class StepToStlConverter:
                   f"{optimized_faces:,} 三角面 (↓{face_reduction:.1f}%)") 
             
             # 🔧 简化版验证：只检查基本有效性
-            print("🔧 [优化] 验证网格...", end='', flush=True)
+            print("🔧 [优化] 验证网格...", end='')
             
             # 检查面索引是否有效
-            max_index = len(mesh.vertices) - 1
-            if len(mesh.faces) > 0 and mesh.faces.max() > max_index:
+            max_index = len(vertices) - 1
+            if len(faces) > 0 and faces.max() > max_index:
                 print(f"\n⚠️  警告: 检测到无效的面索引，跳过优化", file=sys.stderr)
                 return None
             
             # 检查是否有面
-            if len(mesh.faces) == 0:
+            if len(faces) == 0:
                 print(f"\n⚠️  警告: 优化后没有三角面，跳过优化", file=sys.stderr)
                 return None
             
             print(" ✓")
             
             # 保存优化后的STL（使用临时文件防止数据丢失）
-            print("🔧 [优化] 保存优化后的STL...", end='', flush=True) 
+            print("🔧 [优化] 保存优化后的STL...", end='', flush=PROGRESS_FLUSH) 
             
             # 🔧 修复：使用 _temp.stl 而不是 .stl.tmp（保持 .stl 后缀）
             temp_path = stl_path.parent / f"{stl_path.stem}_temp.stl"
             
             try:
-                # 显式指定文件类型为 stl
-                mesh.export(str(temp_path), file_type='stl')
+                # 直接用 NumPy 结构化数组写二进制STL
+                written = _write_stl_binary(temp_path, vertices, faces)
                 
                 # 验证导出的文件
-                if temp_path.exists() and temp_path.stat().st_size > 0:
+                if written > 0:
                     # 成功，替换原文件
                     temp_path.replace(stl_path)
+                    self._file_sizes[stl_path] = written
                     print(" ✓") 
                 else:
                     print(f"\n⚠️  警告: 导出的文件无效，保留原始文件", file=sys.stderr)
@@ -247,54 +1073,59 @@ class StepToStlConverter:
                     temp_path.unlink()
                 return None
             
-            optimized_size = stl_path.stat().st_size / (1024 * 1024) 
+            optimized_size = self._file_size(stl_path) / (1024 * 1024) 
             size_reduction = (1 - optimized_size / original_size) * 100 if original_size > 0 else 0
             
             print(f"✅ [优化] 文件大小: {original_size:.2f} MB → {optimized_size:.2f} MB " 
                   f"(↓{size_reduction:.1f}%)") 
             
-            return stl_path
+            return vertices, faces
             
         except Exception as e: 
             print(f"\n⚠️  警告: STL优化失败 - {str(e)}", file=sys.stderr) 
-            import traceback
             traceback.print_exc(file=sys.stderr)
             return None
     
-    def export_glb(self, stl_path: Path, glb_path: Optional[Path] = None) -> Optional[Path]: 
+    def export_glb(self, mesh, stl_path: Path, glb_path: Optional[Path] = None, 
+                   deflection=None) -> Optional[Path]: 
         """ 
-        将STL转换为GLB格式
+        将内存中的网格导出为GLB格式
         
         Args: 
-            stl_path: STL文件路径
+            mesh: load_stl/optimize_stl 得到的网格
+            stl_path: 对应的STL文件路径（用于默认输出路径和大小对比） 
             glb_path: GLB输出路径（可选） 
+            deflection: 网格化使用的线性偏差（可选，用于判断能否量化顶点） 
             
         Returns: 
             Path: GLB文件路径，失败返回None
         """ 
-        if not TRIMESH_AVAILABLE: 
-            print("⚠️  警告: 未安装trimesh，无法导出GLB", file=sys.stderr) 
-            print("   安装命令: pip install trimesh", file=sys.stderr) 
+        if not NUMPY_AVAILABLE: 
+            print("⚠️  警告: 未安装numpy，无法导出GLB", file=sys.stderr) 
+            print("   安装命令: pip install numpy", file=sys.stderr) 
             return None
+        _import_numpy()
         
         if glb_path is None: 
             glb_path = stl_path.with_suffix('.glb') 
         
         try: 
             print(f"\n📦 [GLB] 转换为GLB格式...") 
-            print("📦 [GLB] 加载STL网格...", end='', flush=True) 
-            
-            # 加载STL
-            mesh = trimesh.load_mesh(str(stl_path), process=False) 
-            print(" ✓") 
             
-            # 导出为GLB
-            print("📦 [GLB] 导出GLB格式...", end='', flush=True) 
-            mesh.export(str(glb_path), file_type='glb') 
+            # 导出为GLB（直接写 glTF 二进制）
+            print("📦 [GLB] 导出GLB格式...", end='', flush=PROGRESS_FLUSH) 
+            vertices = mesh[0]
+            # 启用量化且量化误差远小于网格化误差时，顶点改存 uint16（体积约减少1/3）；
+            # 默认保持 float32，保证任何glTF查看器都能打开
+            quantize = False
+            if self.glb_quantize and deflection is not None and len(vertices) > 0: 
+                step = float(np.ptp(vertices, axis=0).max()) / GLB_QUANT_STEPS
+                quantize = step <= deflection * self.GLB_QUANTIZE_RATIO
+            self._file_sizes[glb_path] = _write_glb(glb_path, vertices, mesh[1], quantize) 
             print(" ✓") 
             
-            stl_size = stl_path.stat().st_size / (1024 * 1024) 
-            glb_size = glb_path.stat().st_size / (1024 * 1024) 
+            stl_size = self._file_size(stl_path) / (1024 * 1024) 
+            glb_size = self._file_size(glb_path) / (1024 * 1024) 
             ratio = (1 - glb_size / stl_size) * 100
             
             print(f"✅ [GLB] 导出成功: {glb_path.name}") 
@@ -306,6 +1137,75 @@ class StepToStlConverter:
             print(f"\n⚠️  警告: GLB导出失败 - {str(e)}", file=sys.stderr) 
             return None
     
+    def compress_outputs(self, file_paths) -> Optional[Path]: 
+        """ 
+        按 self.compressor 压缩输出文件，多个文件打包进同一个压缩包
+        
+        Args: 
+            file_paths: 要压缩的文件路径列表（第一个为STL）
+            
+        Returns: 
+            Path: 压缩包路径，失败返回None
+        """ 
+        first = file_paths[0]
+        if self.compressor == 'zstd': 
+            if len(file_paths) == 1: 
+                return self.compress_files_zstd(file_paths, first.with_suffix(first.suffix + '.zst'))
+            return self.compress_files_zstd(file_paths, first.with_suffix('.tar.zst'))
+        if len(file_paths) == 1: 
+            return self.compress_file(first)
+        return self.compress_files(file_paths, first.with_suffix('.zip'))
+    
+    def compress_files_zstd(self, file_paths, archive_path: Path) -> Optional[Path]: 
+        """ 
+        用 Zstandard 压缩文件（单个文件为 .zst，多个文件为流式 .tar.zst）
+        
+        Args: 
+            file_paths: 要压缩的文件路径列表
+            archive_path: 输出路径
+            
+        Returns: 
+            Path: 压缩包路径，失败返回None
+        """ 
+        try: 
+            names = ', '.join(p.name for p in file_paths)
+            print(f"🗜️  [压缩] 压缩 {names}...", end='', flush=PROGRESS_FLUSH) 
+            
+            original_size = 0
+            for file_path in file_paths: 
+                original_size += self._file_size(file_path)
+            original_size /= 1024 * 1024
+            
+            # 并行模式下使用全部核心；批量多进程时每个进程单线程
+            cctx = zstandard.ZstdCompressor(level=self.ZSTD_LEVEL,
+                                            threads=-1 if self.parallel else 0)
+            with open(archive_path, 'wb') as dst: 
+                if len(file_paths) == 1: 
+                    with open(file_paths[0], 'rb', buffering=0) as src: 
+                        cctx.copy_stream(src, dst, read_size=ZIP_STREAM_CHUNK)
+                else: 
+                    # tar 头和文件内容直接流经压缩器，不生成中间 .tar
+                    writer = cctx.stream_writer(dst)
+                    with tarfile.open(fileobj=writer, mode='w|') as tar: 
+                        for file_path in file_paths: 
+                            tar.add(str(file_path), arcname=file_path.name)
+                    writer.flush(zstandard.FLUSH_FRAME)
+                archive_bytes = dst.tell()
+            
+            self._file_sizes[archive_path] = archive_bytes
+            compressed_size = archive_bytes / (1024 * 1024) 
+            ratio = (1 - compressed_size / original_size) * 100 if original_size > 0 else 0
+            
+            print(" ✓") 
+            print(f"✅ [压缩] {archive_path.name}: {original_size:.2f} MB → {compressed_size:.2f} MB " 
+                  f"(↓{ratio:.1f}%)") 
+            
+            return archive_path
+            
+        except Exception as e: 
+            print(f"\n⚠️  警告: 压缩失败 - {str(e)}", file=sys.stderr) 
+            return None
+    
     def compress_file(self, file_path: Path) -> Optional[Path]: 
         """ 
         压缩文件为ZIP
@@ -316,17 +1216,60 @@ class StepToStlConverter:
         Returns: 
             Path: ZIP文件路径，失败返回None
         """ 
-        zip_path = file_path.with_suffix(file_path.suffix + '.zip') 
+        return self.compress_files([file_path], file_path.with_suffix(file_path.suffix + '.zip'))
+    
+    def compress_files(self, file_paths, zip_path: Path) -> Optional[Path]: 
+        """ 
+        把多个文件压缩进同一个ZIP
         
+        Args: 
+            file_paths: 要压缩的文件路径列表
+            zip_path: ZIP输出路径
+            
+        Returns: 
+            Path: ZIP文件路径，失败返回None
+        """ 
         try: 
-            print(f"🗜️  [压缩] 压缩 {file_path.name}...", end='', flush=True) 
+            names = ', '.join(p.name for p in file_paths)
+            print(f"🗜️  [压缩] 压缩 {names}...", end='', flush=PROGRESS_FLUSH) 
             
-            original_size = file_path.stat().st_size / (1024 * 1024) 
+            # 需要 mtime 写入ZIP，stat 一次顺便记录大小
+            stats = [p.stat() for p in file_paths]
+            for file_path, stat in zip(file_paths, stats): 
+                self._file_sizes[file_path] = stat.st_size
+            total_size = sum(stat.st_size for stat in stats)
+            original_size = total_size / (1024 * 1024) 
             
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as zipf: 
-                zipf.write(file_path, file_path.name) 
+            if total_size >= ZIP32_LIMIT: 
+                # 超过4GB需要 Zip64，交给 zipfile
+                # 压缩级别通过 ZipFile 的公开参数传入；ZipFile.open(ZipInfo) 会忽略该参数，
+                # 所以用 write()（按文件大小自动启用 Zip64，并保留修改时间）
+                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED,
+                                     compresslevel=self.compress_level) as zipf: 
+                    for file_path in file_paths: 
+                        zipf.write(file_path, file_path.name)
+                zip_bytes = zip_path.stat().st_size
+            elif DEFLATE_AVAILABLE and total_size < ZIP_STREAM_THRESHOLD: 
+                # libdeflate 整块压缩（同级别下比 zlib 更快、压缩率更高）
+                levels = [self.compress_level] * len(file_paths)
+                if self.parallel and len(file_paths) > 1: 
+                    # 多个文件各自独立压缩，线程并行，主线程只负责写ZIP
+                    with ThreadPoolExecutor(max_workers=min(len(file_paths), os.cpu_count() or 1)) as pool: 
+                        results = list(pool.map(_precompress, file_paths, levels))
+                else: 
+                    results = list(map(_precompress, file_paths, levels))
+                zip_bytes = _write_deflated_zip(zip_path, [
+                    (file_path.name, payload, crc, size, stat.st_mtime)
+                    for file_path, stat, (payload, crc, size) in zip(file_paths, stats, results)
+                ])
+            else: 
+                # 大文件分块流式压缩，避免整个文件驻留内存（32位系统）
+                zip_bytes = _write_streamed_zip(
+                    zip_path, [(p, stat.st_mtime) for p, stat in zip(file_paths, stats)],
+                    self.compress_level)
             
-            compressed_size = zip_path.stat().st_size / (1024 * 1024) 
+            self._file_sizes[zip_path] = zip_bytes
+            compressed_size = zip_bytes / (1024 * 1024) 
             ratio = (1 - compressed_size / original_size) * 100
             
             print(" ✓") 
@@ -364,12 +1307,14 @@ class StepToStlConverter:
         shape = None
         mesh = None
         
-        # 检查输入文件
-        if not input_file.exists():
+        # 检查输入文件（一次 stat 同时判断存在性和取得大小）
+        try:
+            input_size = input_file.stat().st_size / (1024 * 1024)
+        except OSError:
             print(f"❌ 错误: 文件不存在 - {input_path}", file=sys.stderr)
             return False
         
-        if input_file.suffix not in self.SUPPORTED_EXTENSIONS:
+        if input_file.suffix.lower() not in self.SUPPORTED_EXTENSIONS:
             print(f"❌ 错误: 不支持的文件格式 - {input_file.suffix}", file=sys.stderr)
             return False
         
@@ -379,7 +1324,8 @@ class StepToStlConverter:
         else:
             output_file = Path(output_path).resolve()
             
-            if str(output_path).endswith(('/', '\\')) or (output_file.exists() and output_file.is_dir()):
+            # is_dir() 对不存在的路径返回 False，一次 stat 代替 exists()+is_dir()
+            if str(output_path).endswith(('/', '\\')) or output_file.is_dir():
                 output_file = output_file / f"{input_file.stem}.stl"
             elif output_file.suffix.lower() != '.stl':
                 if not output_file.parent.exists():
@@ -395,7 +1341,6 @@ class StepToStlConverter:
             print(f"   详细信息: {str(e)}", file=sys.stderr)
             return False
         
-        input_size = input_file.stat().st_size / (1024 * 1024)
         print(f"\n{'='*70}")
         print(f"📁 输入文件: {input_file.name} ({input_size:.2f} MB)")
         print(f"📂 输出文件: {output_file}")
@@ -413,8 +1358,8 @@ class StepToStlConverter:
             # ========================================
             # 🚀 优化5：STEP预读取优化
             # ========================================
-            print("📖 [1/4] 读取STEP文件...", end='', flush=True)
-            step_reader = STEPControl_Reader()
+            print("📖 [1/4] 读取STEP文件...", end='', flush=PROGRESS_FLUSH)
+            step_reader = self.get_step_reader()
             
             # 🚀 优化：设置更高效的读取参数
             # 获取接口并设置优化参数
@@ -428,7 +1373,7 @@ class StepToStlConverter:
             print(" ✓")
             
             # 2. 传输数据
-            print("🔄 [2/4] 传输几何数据...", end='', flush=True)
+            print("🔄 [2/4] 传输几何数据...", end='', flush=PROGRESS_FLUSH)
             step_reader.TransferRoots()
             shape = step_reader.OneShape()
             
@@ -438,9 +1383,19 @@ class StepToStlConverter:
             print(" ✓")
             
             # 3. 计算网格参数
-            print("📐 [3/4] 分析模型尺寸...", end='', flush=True)
+            print("📐 [3/4] 分析模型尺寸...", end='', flush=PROGRESS_FLUSH)
             
-            if self.relative:
+            # BRepMesh 的 isRelative 参数
+            occ_relative = False
+            mesh_deflection = None
+            if self.relative and self.native_relative:
+                # OCC原生相对模式：不遍历包围盒，偏差由OCC按子形状尺寸换算
+                linear_def = None
+                mesh_deflection = self.linear_deflection
+                occ_relative = True
+                print(f" ✓")
+                print(f"   🎯 网格精度: OCC相对误差 {self.linear_deflection*100}%")
+            elif self.relative:
                 calculated_deflection, max_dim, dims = self.calculate_deflection(
                     shape, self.linear_deflection
                 )
@@ -452,16 +1407,14 @@ class StepToStlConverter:
                 linear_def = self.linear_deflection
                 print(f" ✓")
                 print(f"   🎯 网格精度: {linear_def:.4f} mm (绝对误差)")
+            if mesh_deflection is None:
+                mesh_deflection = linear_def
             
             # 4. 生成网格
-            print("🔨 [4/4] 生成STL网格...", end='', flush=True)
-            mesh = BRepMesh_IncrementalMesh(
-                shape,
-                linear_def,
-                False,
-                self.angular_deflection,
-                self.parallel
-            )
+            print("🔨 [4/4] 生成STL网格...", end='', flush=PROGRESS_FLUSH)
+            if self.parallel:
+                _configure_occt_threads()
+            mesh = self.build_mesher(shape, mesh_deflection, occ_relative)
             mesh.Perform()
             
             if not mesh.IsDone():
@@ -472,11 +1425,9 @@ class StepToStlConverter:
             # ========================================
             # 🚀 优化6：STL写入优化
             # ========================================
-            print("💾 保存STL文件...", end='', flush=True)
-            stl_writer = StlAPI_Writer()
-            
-            # 🚀 优化：强制使用二进制模式（更快、更小）
-            stl_writer.SetASCIIMode(ascii_mode)
+            print("💾 保存STL文件...", end='', flush=PROGRESS_FLUSH)
+            # 🚀 优化：批量转换复用同一个写入器，默认二进制模式（更快、更小）
+            stl_writer = self.get_stl_writer(ascii_mode)
             
             # 🚀 优化：直接写入，避免中间缓存
             success = stl_writer.Write(shape, str(output_file))
@@ -486,31 +1437,39 @@ class StepToStlConverter:
                 return False
             print(" ✓")
             
-            original_stl_size = output_file.stat().st_size / (1024 * 1024)
+            original_stl_size = self._file_size(output_file) / (1024 * 1024)
             print(f"   📊 初始STL大小: {original_stl_size:.2f} MB")
             
-            # 6. 优化STL（如果启用）
-            if optimize:
+            # 6. 加载STL网格（优化和GLB导出共用，只解析一次）
+            stl_mesh = None
+            if optimize or export_glb:
                 print()
-                optimized = self.optimize_stl(output_file)
-                if optimized:
-                    output_file = optimized
+                # 不优化时GLB直接用三角面汤，先无损合并重合顶点
+                stl_mesh = self.load_stl(output_file, merge=export_glb and not optimize)
             
-            # 7. 导出GLB（如果启用）
+            # 7. 优化STL（如果启用）
+            if optimize and stl_mesh is not None:
+                # 只有GLB带索引缓冲区，合并顶点才有意义；ASCII STL沿用原流程
+                optimized = self.optimize_stl(stl_mesh, output_file, linear_def,
+                                              weld=export_glb or ascii_mode)
+                if optimized is not None:
+                    stl_mesh = optimized
+            
+            # 8. 导出GLB（如果启用）
             glb_file = None
-            if export_glb:
-                glb_file = self.export_glb(output_file)
+            if export_glb and stl_mesh is not None:
+                glb_file = self.export_glb(stl_mesh, output_file, deflection=linear_def)
             
-            # 8. 压缩文件（如果启用）
+            # 9. 压缩文件（如果启用）
+            # 同时导出GLB时，STL和GLB打包进同一个压缩包
+            zip_file = None
             if auto_zip:
                 print()
-                self.compress_file(output_file)
-                if glb_file:
-                    self.compress_file(glb_file)
+                zip_file = self.compress_outputs([output_file, glb_file] if glb_file else [output_file])
             
             # 统计信息
             elapsed_time = time.time() - start_time
-            final_stl_size = output_file.stat().st_size / (1024 * 1024)
+            final_stl_size = self._file_size(output_file) / (1024 * 1024)
             
             print(f"\n{'='*70}")
             print(f"✅ 转换成功!")
@@ -519,17 +1478,13 @@ class StepToStlConverter:
             print(f"\n📦 输出文件:")
             print(f"   📄 STL: {output_file.name} ({final_stl_size:.2f} MB)")
             
-            if auto_zip and output_file.with_suffix('.stl.zip').exists():
-                zip_size = output_file.with_suffix('.stl.zip').stat().st_size / (1024 * 1024)
-                print(f"   🗜️  STL.ZIP: {output_file.stem}.stl.zip ({zip_size:.2f} MB)")
-            
-            if glb_file and glb_file.exists():
-                glb_size = glb_file.stat().st_size / (1024 * 1024)
+            if glb_file:
+                glb_size = self._file_size(glb_file) / (1024 * 1024)
                 print(f"   📦 GLB: {glb_file.name} ({glb_size:.2f} MB)")
-                
-                if auto_zip and glb_file.with_suffix('.glb.zip').exists():
-                    glb_zip_size = glb_file.with_suffix('.glb.zip').stat().st_size / (1024 * 1024)
-                    print(f"   🗜️  GLB.ZIP: {glb_file.stem}.glb.zip ({glb_zip_size:.2f} MB)")
+            
+            if zip_file:
+                zip_size = self._file_size(zip_file) / (1024 * 1024)
+                print(f"   🗜️  压缩包: {zip_file.name} ({zip_size:.2f} MB)")
             
             print(f"{'='*70}\n")
             
@@ -538,7 +1493,6 @@ class StepToStlConverter:
         except Exception as e:
             print(f"\n❌ 错误: 转换失败", file=sys.stderr)
             print(f"   详细信息: {str(e)}", file=sys.stderr)
-            import traceback
             traceback.print_exc(file=sys.stderr)
             return False
         
@@ -547,20 +1501,30 @@ class StepToStlConverter:
             # 🚀 优化2：内存释放（附加优化，防止内存泄漏）
             # ========================================
             try:
+                # 包围盒缓存持有shape引用，一并释放
+                self._bbox_cache = None
+                self._file_sizes.clear()
+                # 读取器复用，但不保留上一个文件的模型数据
+                self._release_step_reader()
                 if shape is not None:
                     del shape
                 if mesh is not None:
                     del mesh
-                # 强制垃圾回收
-                import gc
-                gc.collect()
+                # 不再每个文件强制 gc.collect()：OCC对象和网格数组都由引用计数
+                # 即时释放，全量回收只会随存活对象数增加批量转换的耗时
             except:
                 pass
     
     def convert_directory(self, input_dir: str, output_dir: Optional[str] = None, 
                          ascii_mode=False, optimize=False, export_glb=False, 
-                         auto_zip=False) -> dict: 
-        """批量转换目录中的所有STEP/STP文件""" 
+                         auto_zip=False, jobs=None) -> dict: 
+        """
+        批量转换目录中的所有STEP/STP文件
+        
+        Args:
+            jobs: 并行进程数（默认1，串行；每个进程都完整加载一个STEP模型，
+                  内存占用随进程数成倍增加）
+        """ 
         input_path = Path(input_dir) 
         
         if not input_path.exists() or not input_path.is_dir(): 
@@ -575,9 +1539,14 @@ class StepToStlConverter:
             output_path.mkdir(parents=True, exist_ok=True) 
         
         # 查找所有STEP/STP文件
-        files = [] 
-        for ext in self.SUPPORTED_EXTENSIONS: 
-            files.extend(input_path.glob(f"*{ext}")) 
+        # 一次 scandir，按小写后缀过滤（glob 每个后缀各扫一遍目录，
+        # 且在 Windows 上 *.step 与 *.STEP 会重复匹配同一文件）
+        # 直接保留 DirEntry 的名称和路径字符串，不为每个文件构造 Path
+        with os.scandir(input_path) as it: 
+            files = sorted(
+                (entry.name, entry.path) for entry in it
+                if entry.name.lower().endswith(self.SUPPORTED_EXTENSIONS) and entry.is_file()
+            )
         
         if not files: 
             print(f"⚠️  警告: 在目录中未找到STEP/STP文件 - {input_dir}", file=sys.stderr) 
@@ -588,17 +1557,56 @@ class StepToStlConverter:
         results = {'success': 0, 'failed': 0, 'total': len(files)} 
         start_time = time.time() 
         
-        for idx, file in enumerate(files, 1): 
-            print(f"\n{'#'*70}") 
-            print(f"📦 [{idx}/{len(files)}] 处理: {file.name}") 
-            print(f"{'#'*70}") 
-            output_file = output_path / f"{file.stem}.stl" 
+        # 输出路径前缀只拼一次，每个文件按字符串拼接
+        output_prefix = os.path.join(str(output_path), '')
+        tasks = [
+            (path, f"{output_prefix}{os.path.splitext(name)[0]}.stl", ascii_mode,
+             optimize, export_glb, auto_zip)
+            for name, path in files
+        ]
+        
+        jobs = min(jobs or 1, len(files))
+        
+        if jobs <= 1: 
+            for idx, ((name, _), args) in enumerate(zip(files, tasks), 1): 
+                print(f"\n{'#'*70}") 
+                print(f"📦 [{idx}/{len(files)}] 处理: {name}") 
+                print(f"{'#'*70}") 
+                
+                if self.convert_file(*args): 
+                    results['success'] += 1
+                else: 
+                    results['failed'] += 1
+        else: 
+            # 🚀 多进程：每个文件互不依赖，按 --jobs 并行转换
+            print(f"🚀 并行转换: {jobs} 个进程") 
+            # 进程间已并行，关闭BRepMesh内部多线程避免超额订阅
+            worker = copy.copy(self)
+            worker.parallel = False
             
-            if self.convert_file(str(file), str(output_file), ascii_mode, 
-                               optimize, export_glb, auto_zip): 
-                results['success'] += 1
-            else: 
-                results['failed'] += 1
+            with ProcessPoolExecutor(max_workers=jobs) as pool: 
+                futures = {
+                    pool.submit(_convert_file_worker, worker, args): name
+                    for (name, _), args in zip(files, tasks)
+                }
+                # 按完成顺序统计，先完成的文件立即整块输出日志并汇报进度
+                for done, future in enumerate(as_completed(futures), 1): 
+                    name = futures[future]
+                    try: 
+                        ok, out, err = future.result()
+                        sys.stdout.write(out)
+                        if err: 
+                            # 先刷出 stdout，终端上两路输出保持先后顺序
+                            sys.stdout.flush()
+                            sys.stderr.write(err)
+                    except Exception as e: 
+                        print(f"❌ 错误: 子进程异常 - {name}: {e}", file=sys.stderr) 
+                        ok = False
+                    if ok: 
+                        results['success'] += 1
+                    else: 
+                        results['failed'] += 1
+                    print(f"📦 [{done}/{len(files)}] {'✅' if ok else '❌'} {name}", flush=PROGRESS_FLUSH) 
         
         # 总结
         total_time = time.time() - start_time
@@ -637,6 +1645,7 @@ def main():
 
   6️⃣  批量转换: 
      step2stl input_dir/ output_dir/ --optimize --glb
+     step2stl input_dir/ output_dir/ -j 4   （4个进程并行）
 
   7️⃣  高质量转换: 
      step2stl model.step -q high --optimize
@@ -654,7 +1663,10 @@ def main():
 🔧 优化选项: 
    --optimize  去除重复顶点，优化网格（推荐） 
    --glb       同时导出GLB格式（文件更小） 
+   --glb-quantize  GLB顶点16位量化（更小，查看器需支持 KHR_mesh_quantization）
    --zip       自动压缩输出文件
+   --zip-level 压缩级别 1-9（默认6，9 只多压缩约1%）
+   --compressor zstd  改用 Zstandard 压缩（更快、更小，需要 zstandard）
 
 💡 状态码: 
    0 - 转换成功
@@ -666,7 +1678,8 @@ def main():
 
 📦 依赖安装: 
    基础功能:  pip install pythonocc-core
-   优化/GLB:  pip install trimesh numpy
+   优化/GLB:  pip install numpy
+   zstd压缩:  pip install zstandard
         """ 
     ) 
     
@@ -684,7 +1697,7 @@ def main():
     
     parser.add_argument( 
         '-q', '--quality', 
-        choices=['draft', 'low', 'medium', 'high', 'ultra'], 
+        choices=list(StepToStlConverter.QUALITY_PRESETS), 
         default='low', 
         help='质量预设 (默认: low)' 
     ) 
@@ -709,12 +1722,31 @@ def main():
         help='使用绝对误差而非相对误差' 
     ) 
     
+    parser.add_argument( 
+        '--occ-relative', 
+        action='store_true', 
+        help='相对误差由OCC按每个面/边的尺寸计算（跳过包围盒分析）' 
+    ) 
+    
+    parser.add_argument( 
+        '--allow-quality-decrease', 
+        action='store_true', 
+        help='允许OCC在难以满足精度的面上放宽偏差（更快，但可能超出精度，OCC 7.5+）' 
+    ) 
+    
     parser.add_argument( 
         '--no-parallel', 
         action='store_true', 
         help='禁用并行处理（兼容低配电脑）' 
     ) 
     
+    parser.add_argument( 
+        '-j', '--jobs', 
+        type=int, 
+        default=None, 
+        help='批量转换的并行进程数（默认: 1 串行；每个进程完整加载一个模型，内存成倍增加）' 
+    ) 
+    
     parser.add_argument( 
         '--ascii', 
         action='store_true', 
@@ -733,18 +1765,44 @@ def main():
         help='同时导出GLB格式' 
     ) 
     
+    parser.add_argument( 
+        '--glb-quantize', 
+        action='store_true', 
+        help='GLB顶点量化为16位（体积约减少1/3；需要查看器支持 KHR_mesh_quantization 扩展）' 
+    ) 
+    
     parser.add_argument( 
         '--zip', 
         action='store_true', 
         help='自动压缩输出文件' 
     ) 
     
+    parser.add_argument( 
+        '--zip-level', 
+        type=int, 
+        choices=range(1, 10), 
+        default=6, 
+        metavar='{1-9}', 
+        help='ZIP压缩级别 (默认: 6；1 最快，9 体积最小但慢2-3倍)' 
+    ) 
+    
+    parser.add_argument( 
+        '--compressor', 
+        choices=['deflate', 'zstd'], 
+        default=None, 
+        help='--zip 的压缩格式 (默认: deflate 输出ZIP；zstd 输出 .zst/.tar.zst)' 
+    ) 
+    
     args = parser.parse_args() 
     
+    if args.compressor is not None and not args.zip: 
+        parser.error('--compressor 需要与 --zip 一起使用')
+    args.compressor = args.compressor or 'deflate'
+    
     # 检查优化功能依赖
-    if (args.optimize or args.glb) and not TRIMESH_AVAILABLE: 
-        print("⚠️  警告: 优化和GLB功能需要安装 trimesh", file=sys.stderr) 
-        print("   安装命令: pip install trimesh numpy", file=sys.stderr) 
+    if (args.optimize or args.glb) and not NUMPY_AVAILABLE: 
+        print("⚠️  警告: 优化和GLB功能需要安装 numpy", file=sys.stderr) 
+        print("   安装命令: pip install numpy", file=sys.stderr) 
         print() 
         response = input("是否继续进行基础转换? (y/n): ") 
         if response.lower() != 'y': 
@@ -752,13 +1810,23 @@ def main():
         args.optimize = False
         args.glb = False
     
+    if args.compressor == 'zstd' and not ZSTD_AVAILABLE: 
+        print("⚠️  警告: 未安装 zstandard，改用ZIP压缩", file=sys.stderr) 
+        print("   安装命令: pip install zstandard", file=sys.stderr) 
+        args.compressor = 'deflate'
+    
     # 创建转换器 默认启用并行
     converter = StepToStlConverter( 
         quality=args.quality, 
         linear_deflection=args.linear_deflection, 
         angular_deflection=args.angular_deflection, 
         relative=not args.absolute,
-        parallel=not args.no_parallel
+        parallel=not args.no_parallel,
+        native_relative=args.occ_relative,
+        allow_quality_decrease=args.allow_quality_decrease,
+        glb_quantize=args.glb_quantize,
+        compress_level=args.zip_level,
+        compressor=args.compressor
     ) 
     
     input_path = Path(args.input) 
@@ -774,7 +1842,7 @@ def main():
     elif input_path.is_dir(): 
         results = converter.convert_directory( 
             args.input, args.output, args.ascii, 
-            args.optimize, args.glb, args.zip
+            args.optimize, args.glb, args.zip, args.jobs
         ) 
         sys.exit(EXIT_SUCCESS if results['failed'] == 0 else EXIT_ERROR_CONVERSION_FAILED) 
         
@@ -783,4 +1851,6 @@ def main():
         sys.exit(EXIT_ERROR_FILE_NOT_FOUND) 
 
 if __name__ == '__main__': 
+    # PyInstaller 打包后的子进程需要
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -131,18 +131,17 @@ try:
 except:
     hiddenimports.extend(['jaraco.text', 'jaraco.functools', 'jaraco.context'])
 
-# Trimesh
-try:
-    tm_hidden = collect_submodules('trimesh')
-    if tm_hidden: hiddenimports.extend(tm_hidden)
-except:
-    hiddenimports.append('trimesh')
+# libdeflate (optional)
+hiddenimports.append('deflate')
+
+# zstandard (optional, --compressor zstd)
+hiddenimports.append('zstandard')
 
 # OCC
 hiddenimports.extend([
     'OCC', 'OCC.Core',
     'OCC.Core.STEPControl', 'OCC.Core.StlAPI', 'OCC.Core.BRepMesh',
-    'OCC.Core.IFSelect', 'OCC.Core.Bnd', 'OCC.Core.BRepBndLib',
+    'OCC.Core.IFSelect', 'OCC.Core.Bnd', 'OCC.Core.BRepBndLib', 'OCC.Core.OSD', 'OCC.Core.IMeshTools',
     'OCC.Core.TCollection', 'OCC.Core.Standard', 'OCC.Core.TopoDS',
     'OCC.Core.Wrappers' # 可能会用到
 ])